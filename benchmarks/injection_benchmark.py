@@ -0,0 +1,49 @@
+"""
+Micro-benchmark comparing calls per second of a bare function and a @gyjd wrapped one.
+
+Usage: python benchmarks/injection_benchmark.py [--calls N]
+"""
+
+import argparse
+import logging
+import time
+
+from gyjd import gyjd
+from gyjd.config import LoggerConfig
+
+
+def bare(a: int, b: int) -> int:
+    return a + b
+
+
+@gyjd
+def wrapped(a: int, b: int) -> int:
+    return a + b
+
+
+@gyjd
+def wrapped_with_injection(a: int, b: int, logger: logging.Logger = None, config: LoggerConfig = None) -> int:
+    return a + b
+
+
+def measure(func, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i, 1)
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    baseline = measure(bare, args.calls)
+    print(f"{'bare':<24} {baseline:>14,.0f} calls/s")
+    for name, func in (("gyjd", wrapped), ("gyjd + injection", wrapped_with_injection)):
+        rate = measure(func, args.calls)
+        print(f"{name:<24} {rate:>14,.0f} calls/s  ({baseline / rate:.1f}x slower than bare)")
+
+
+if __name__ == "__main__":
+    main()
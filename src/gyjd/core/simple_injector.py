@@ -4,9 +4,15 @@ from functools import wraps
 from typing import Callable, Literal, Type
 
 _DEPENDENCIES_REGISTER: dict[Type, "DependencyHandler"] = {}
+_REGISTER_VERSION = 0
 IF_EXISTS_TYPE = Literal["raise", "skip", "overwrite"]
 
 
+def _bump_register_version():
+    global _REGISTER_VERSION
+    _REGISTER_VERSION += 1
+
+
 class DependencyHandler:
     def __init__(self, instance_builder: Callable, reuse_times: int = -1):
         self._instance_generator = self._build_instance_generator(
@@ -34,22 +40,78 @@ class DependencyHandler:
         return next(self._instance_generator)
 
 
+class InjectionPlan:
+    """
+    Precomputed view of a function signature used by inject_dependencies.
+
+    The parameter-to-type map is resolved once per function. The injectable slots, the subset of
+    parameters whose type is currently registered, are rebuilt only when the dependency register changes.
+    """
+
+    __slots__ = ("_func", "_parameter_types", "_slots", "_version")
+
+    def __init__(self, func: Callable):
+        self._func = func
+        self._parameter_types: list[tuple[int | None, str, Type]] | None = None
+        self._slots: list[tuple[int | None, str, DependencyHandler]] = []
+        self._version = -1
+
+    @staticmethod
+    def _signature(func: Callable) -> inspect.Signature:
+        try:
+            return inspect.signature(func, eval_str=True)
+        except Exception:
+            return inspect.signature(func)
+
+    def _resolve_parameter_types(self) -> list[tuple[int | None, str, Type]]:
+        parameter_types = []
+        for position, (param_name, param) in enumerate(self._signature(self._func).parameters.items()):
+            if param.annotation is param.empty:
+                continue
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+            if param.kind == param.KEYWORD_ONLY:
+                position = None
+            parameter_types.append((position, param_name, param.annotation))
+        return parameter_types
+
+    @property
+    def parameter_types(self) -> dict[str, Type]:
+        if self._parameter_types is None:
+            self._parameter_types = self._resolve_parameter_types()
+        return {param_name: param_type for _, param_name, param_type in self._parameter_types}
+
+    @property
+    def slots(self) -> list[tuple[int | None, str, DependencyHandler]]:
+        if self._version != _REGISTER_VERSION:
+            version = _REGISTER_VERSION
+            if self._parameter_types is None:
+                self._parameter_types = self._resolve_parameter_types()
+            self._slots = [
+                (position, param_name, _DEPENDENCIES_REGISTER[param_type])
+                for position, param_name, param_type in self._parameter_types
+                if param_type in _DEPENDENCIES_REGISTER
+            ]
+            self._version = version
+        return self._slots
+
+
 def inject_dependencies(func):
+    plan = InjectionPlan(func)
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        func_signature = inspect.signature(func)
-        bound_arguments = func_signature.bind_partial(*args, **kwargs)
-
-        for param_name, param in func_signature.parameters.items():
-            param_type = param.annotation
-
-            if param_type is not param.empty and param_name not in bound_arguments.arguments:
-                found_dependency = _DEPENDENCIES_REGISTER.get(param_type)
-                if found_dependency and param_name not in kwargs:
-                    kwargs[param_name] = found_dependency.get()
+        slots = plan.slots
+        if slots:
+            args_count = len(args)
+            for position, param_name, handler in slots:
+                if param_name in kwargs or (position is not None and position < args_count):
+                    continue
+                kwargs[param_name] = handler.get()
 
         return func(*args, **kwargs)
 
+    wrapper.__gyjd_injection_plan__ = plan
     return wrapper
 
 
@@ -80,6 +142,7 @@ def register_dependency(
         inject_dependencies(func),
         reuse_times=reuse_times,
     )
+    _bump_register_version()
 
     return func
 
@@ -90,3 +153,4 @@ def get_registered_dependencies() -> set[Type]:
 
 def clear_registered_dependencies():
     _DEPENDENCIES_REGISTER.clear()
+    _bump_register_version()
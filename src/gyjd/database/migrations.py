@@ -0,0 +1,91 @@
+import sqlite3
+from collections.abc import Sequence
+
+# Each migration is an ordered group of statements applied in a single transaction.
+# The position in the list (starting at 1) is the schema version stored in PRAGMA user_version.
+Migration = Sequence[str]
+
+EVENT_BUS_MIGRATIONS: list[Migration] = [
+    (
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            processed INTEGER NOT NULL DEFAULT 0,
+            created_at DATETIME NOT NULL,
+            processed_at DATETIME
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS subscribers (
+            task_name TEXT PRIMARY KEY,
+            event_types TEXT NOT NULL,
+            function_path TEXT NOT NULL,
+            mode TEXT NOT NULL DEFAULT 'any',
+            created_at DATETIME NOT NULL,
+            max_attempts INTEGER NOT NULL DEFAULT 1,
+            retry_delay INTEGER NOT NULL DEFAULT 30,
+            concurrency_limit INTEGER NOT NULL DEFAULT 8
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subscriber_task_name TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempt_count INTEGER NOT NULL DEFAULT 0,
+            handled_events TEXT NOT NULL,
+            parameters TEXT NOT NULL,
+            last_attempt_at DATETIME,
+            created_at DATETIME NOT NULL,
+            completed_at DATETIME,
+            scheduled_at DATETIME NOT NULL,
+            FOREIGN KEY(subscriber_task_name) REFERENCES subscribers(task_name)
+        )
+        """,
+    ),
+    (
+        # Only unprocessed events are ever looked up, keep that index small and covering the fan-out join.
+        "CREATE INDEX IF NOT EXISTS events_unprocessed_idx ON events (id, event_type) WHERE processed = 0",
+        "CREATE INDEX IF NOT EXISTS events_event_type_idx ON events (event_type)",
+        # Next due task lookup in run_forever and the due task selection in run_tasks.
+        "CREATE INDEX IF NOT EXISTS tasks_pending_scheduled_idx ON tasks (scheduled_at) WHERE status = 'pending'",
+        # Per subscriber window over due tasks in run_tasks.
+        """
+        CREATE INDEX IF NOT EXISTS tasks_pending_subscriber_idx
+        ON tasks (subscriber_task_name, scheduled_at) WHERE status = 'pending'
+        """,
+        # Per subscriber status lookups, e.g. counting running tasks.
+        "CREATE INDEX IF NOT EXISTS tasks_subscriber_status_idx ON tasks (subscriber_task_name, status)",
+    ),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection, migrations: Sequence[Migration]) -> int:
+    """
+    Bring the database up to len(migrations), applying each pending migration in its own transaction.
+
+    The write lock is taken before reading the version, so concurrent processes opening the same
+    database apply every migration exactly once.
+    """
+    for version, statements in enumerate(migrations, start=1):
+        if get_schema_version(conn) >= version:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) < version:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return get_schema_version(conn)
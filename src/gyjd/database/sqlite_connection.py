@@ -1,5 +1,6 @@
 import asyncio
 import sqlite3
+import threading
 from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 from typing import Literal
@@ -10,6 +11,8 @@ class SQLiteConnection:
 
     def __init__(self, conn_str: str):
         self.conn = sqlite3.connect(conn_str, check_same_thread=False)
+        # Transactions are scoped to the connection, threads must not interleave statements of different cursors.
+        self._thread_lock = threading.RLock()
         self.conn.execute("PRAGMA foreign_keys = ON")
         self.conn.execute("PRAGMA journal_mode = WAL;")
         self._ensure_maintenance_metadata()
@@ -40,6 +43,10 @@ class SQLiteConnection:
         self.conn.execute(f"PRAGMA wal_checkpoint({mode});")
         self._register_event("checkpoint")
 
+    def data_version(self) -> int:
+        """Return a counter that changes whenever another connection commits to the database."""
+        return self.conn.execute("PRAGMA data_version;").fetchone()[0]
+
     def auto_maintenance(self):
         last_vacuum = self._get_last_event_datetime("vacuum")
         if last_vacuum is None or (datetime.utcnow() - last_vacuum).days > 7:
@@ -51,15 +58,16 @@ class SQLiteConnection:
 
     @contextmanager
     def cursor(self):
-        c = self.conn.cursor()
-        try:
-            yield c
-        except Exception:
-            self.conn.rollback()
-            raise
-        finally:
-            c.close()
-            self.conn.commit()
+        with self._thread_lock:
+            c = self.conn.cursor()
+            try:
+                yield c
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                c.close()
+                self.conn.commit()
 
     @asynccontextmanager
     async def async_cursor(self):
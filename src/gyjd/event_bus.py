@@ -1,13 +1,21 @@
 import asyncio
+import atexit
 import importlib
 import json
 import logging
+import threading
+from collections import Counter
+from collections.abc import Iterable
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Literal, TypedDict
 
 from gyjd.database.connection_factory import ConnectionFactory
 
 DEFAULT_RETRY_DELAY = 30
+MIN_IDLE_DELAY = 0.005
+# Same layout as SQLite CURRENT_TIMESTAMP, so that scheduled_at values compare correctly as text.
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 logger = logging.getLogger("gyjd")
 
@@ -23,15 +31,62 @@ MappedEvent = List[MappedEventDict]
 
 
 class EventBus:
-    def __init__(self, polling_interval=10):
-        self._conn = ConnectionFactory.create_connection("event_bus")
+    def __init__(self, polling_interval=10, location: str | Path | None = None, max_workers: int = 16):
+        self._conn = ConnectionFactory.create_connection("event_bus", location=location)
         self.polling_interval = polling_interval
+        self.max_workers = max_workers
+        self._in_flight: set[asyncio.Task] = set()
+        self._running_per_subscriber: Counter[str] = Counter()
+        self._subscriber_semaphores: dict[str, tuple[int, asyncio.Semaphore]] = {}
+        self._interrupted_tasks_requeued = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
 
     def add_event(self, event_type: str, payload: dict):
-        self._conn.conn.execute(
-            "INSERT INTO events (event_type, payload, created_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
-            (event_type, json.dumps(payload)),
-        )
+        with self._conn.cursor() as c:
+            c.execute(
+                "INSERT INTO events (event_type, payload, created_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
+                (event_type, json.dumps(payload)),
+            )
+        self._notify()
+
+    def add_events(self, events: Iterable[tuple[str, dict]]) -> int:
+        """Insert all (event_type, payload) pairs in a single transaction and return how many were added."""
+        rows = [(event_type, json.dumps(payload)) for event_type, payload in events]
+        if not rows:
+            return 0
+
+        with self._conn.cursor() as c:
+            c.executemany(
+                "INSERT INTO events (event_type, payload, created_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
+                rows,
+            )
+        self._notify()
+        return len(rows)
+
+    def buffered_emitter(self, max_events: int = 1000, max_delay: float = 0.05) -> "BufferedEmitter":
+        return BufferedEmitter(self, max_events=max_events, max_delay=max_delay)
+
+    def _notify(self):
+        """Wake up run_forever, either from the loop thread or from any other thread of this process."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            wakeup.set()
+            return
+
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # The loop was closed, there is nobody left to wake up.
+            pass
 
     def subscribe(
         self,
@@ -182,15 +237,57 @@ class EventBus:
                 c.execute("SELECT attempt_count FROM tasks WHERE id = ?", (task_id,))
                 attempt_count = c.fetchone()[0]
                 if attempt_count < max_attempts:
-                    new_time = (datetime.utcnow() + timedelta(seconds=retry_delay)).isoformat()
+                    new_time = (datetime.utcnow() + timedelta(seconds=retry_delay)).strftime(SQLITE_TIMESTAMP_FORMAT)
                     c.execute("UPDATE tasks SET status = 'pending', scheduled_at = ? WHERE id = ?", (new_time, task_id))
                 else:
                     c.execute("UPDATE tasks SET status = 'failed' WHERE id = ?", (task_id,))
 
+    def _subscriber_semaphore(self, subscriber_task_name: str, concurrency_limit: int) -> asyncio.Semaphore:
+        limit, semaphore = self._subscriber_semaphores.get(subscriber_task_name, (None, None))
+        if limit != concurrency_limit:
+            # Tasks already running keep the previous semaphore, new ones use the updated limit.
+            semaphore = asyncio.Semaphore(concurrency_limit)
+            self._subscriber_semaphores[subscriber_task_name] = (concurrency_limit, semaphore)
+        return semaphore
+
+    async def _dispatch(self, task, concurrency_limit: int):
+        subscriber_task_name = task[1]
+        try:
+            async with self._subscriber_semaphore(subscriber_task_name, concurrency_limit):
+                await self._run_task(task)
+        except Exception:
+            logger.exception(f"Unexpected error running task {task[0]} of {subscriber_task_name}")
+        finally:
+            self._running_per_subscriber[subscriber_task_name] -= 1
+            if not self._running_per_subscriber[subscriber_task_name]:
+                del self._running_per_subscriber[subscriber_task_name]
+            # A slot was released, let the dispatcher claim the next task right away.
+            self._notify()
+
+    async def _requeue_interrupted_tasks(self):
+        if self._interrupted_tasks_requeued:
+            return
+        async with self._conn.async_cursor() as c:
+            c.execute("UPDATE tasks SET status = 'pending' WHERE status = 'running'")
+        self._interrupted_tasks_requeued = True
+
     async def run_tasks(self) -> bool:
+        """
+        Claim due tasks for every free slot and start them in the background.
+
+        Slots are bounded by max_workers for the whole bus and by concurrency_limit for each subscriber,
+        counting tasks that are still running from previous calls. Returns True if any task was started.
+        """
+        free_workers = self.max_workers - len(self._in_flight)
+        if free_workers <= 0:
+            return False
+
         logger.info("Looking for tasks to run")
         sql = """
-            WITH bs AS (
+            WITH running AS (
+                SELECT key AS task_name, value AS running_count FROM json_each(?)
+            ),
+            bs AS (
                 SELECT
                     t.id,
                     t.subscriber_task_name,
@@ -198,11 +295,14 @@ class EventBus:
                     t.parameters,
                     t.scheduled_at,
                     s.concurrency_limit,
-                    row_number() OVER (PARTITION BY t.subscriber_task_name ORDER BY t.scheduled_at) AS rn
+                    s.concurrency_limit - coalesce(r.running_count, 0) AS free_slots,
+                    row_number() OVER (PARTITION BY t.subscriber_task_name ORDER BY t.scheduled_at, t.id) AS rn
                 FROM
                     tasks t
                 JOIN subscribers s ON
                     t.subscriber_task_name = s.task_name
+                LEFT JOIN running r ON
+                    r.task_name = t.subscriber_task_name
                 WHERE
                     t.scheduled_at <= CURRENT_TIMESTAMP AND
                     t.status = 'pending'
@@ -211,33 +311,168 @@ class EventBus:
                 id,
                 subscriber_task_name,
                 attempt_count,
-                parameters
+                parameters,
+                concurrency_limit
             FROM bs
-            WHERE rn <= concurrency_limit
-            ORDER BY scheduled_at
-            LIMIT 16
+            WHERE rn <= free_slots
+            ORDER BY scheduled_at, id
+            LIMIT ?
         """
 
         async with self._conn.async_cursor() as c:
-            c.execute(sql)
+            c.execute(sql, (json.dumps(self._running_per_subscriber), free_workers))
             tasks = c.fetchall()
+            c.executemany("UPDATE tasks SET status = 'running' WHERE id = ?", ((t[0],) for t in tasks))
 
         if not tasks:
             logger.info("No tasks to run")
             return False
 
-        await asyncio.gather(*(self._run_task(t) for t in tasks))
+        for *task, concurrency_limit in tasks:
+            self._running_per_subscriber[task[1]] += 1
+            running_task = asyncio.create_task(self._dispatch(tuple(task), concurrency_limit))
+            self._in_flight.add(running_task)
+            running_task.add_done_callback(self._in_flight.discard)
 
         return True
 
-    async def run(self):
-        while await self.run_tasks() or await self.process_events():
-            pass
+    async def _step(self) -> bool:
+        started = await self.run_tasks()
+        processed = await self.process_events()
+        return started or processed
+
+    async def run(self) -> bool:
+        """Run until there are no due tasks, unprocessed events or running tasks left."""
+        await self._requeue_interrupted_tasks()
+        worked = False
+        while True:
+            if await self._step():
+                worked = True
+                continue
+            if not self._in_flight:
+                return worked
+            await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+    async def _seconds_until_next_task(self) -> float | None:
+        async with self._conn.async_cursor() as c:
+            c.execute("SELECT min(scheduled_at) FROM tasks WHERE status = 'pending' AND scheduled_at > CURRENT_TIMESTAMP")
+            (next_scheduled_at,) = c.fetchone()
+
+        if next_scheduled_at is None:
+            return None
+
+        delay = (datetime.fromisoformat(next_scheduled_at) - datetime.utcnow()).total_seconds()
+        return max(delay, 0)
+
+    async def _wait_for_wakeup(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except TimeoutError:
+            return False
+        return True
 
     async def run_forever(self):
+        """
+        Run the bus until cancelled.
+
+        Local emits and finished tasks wake the loop immediately. Changes committed by other processes are
+        detected through PRAGMA data_version, checked with an exponential backoff capped at polling_interval.
+        """
         logger.info("Event bus started")
-        while True:
-            await self.run()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        idle_delay = MIN_IDLE_DELAY
+        await self._requeue_interrupted_tasks()
+
+        try:
+            while True:
+                self._wakeup.clear()
+                if await self._step():
+                    idle_delay = MIN_IDLE_DELAY
+                    continue
+
+                data_version = self._conn.data_version()
+                timeout = idle_delay
+                next_task_delay = await self._seconds_until_next_task()
+                if next_task_delay is not None:
+                    timeout = min(timeout, next_task_delay)
+
+                if await self._wait_for_wakeup(timeout) or self._conn.data_version() != data_version:
+                    idle_delay = MIN_IDLE_DELAY
+                else:
+                    idle_delay = min(idle_delay * 2, self.polling_interval)
+        finally:
+            self._loop = None
+            self._wakeup = None
+            # Cancelled tasks stay 'running' and are requeued the next time the bus starts.
+            for running_task in self._in_flight:
+                running_task.cancel()
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+
+class BufferedEmitter:
+    """
+    Group-commits emitted events, writing them once max_events are buffered or max_delay seconds
+    after the first buffered event, whichever comes first.
+
+    Events are only durable after a flush. Use it as a context manager or call close() at shutdown;
+    pending events are also flushed when the interpreter exits.
+    """
+
+    def __init__(self, bus: EventBus, max_events: int = 1000, max_delay: float = 0.05):
+        if max_events < 1:
+            raise ValueError("max_events must be at least 1")
+
+        self._bus = bus
+        self._max_events = max_events
+        self._max_delay = max_delay
+        self._buffer: list[tuple[str, dict]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def emmit(self, *, event_type: str, payload: dict):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BufferedEmitter is closed")
+            self._buffer.append((event_type, payload))
+            should_flush = len(self._buffer) >= self._max_events
+            if not should_flush and self._timer is None:
+                self._timer = threading.Timer(self._max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every buffered event in one transaction and return how many were written."""
+        # Flushes are serialized so events are committed in the order they were emitted.
+        with self._flush_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            return self._bus.add_events(events)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self.flush()
+        atexit.unregister(self.close)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __enter__(self) -> "BufferedEmitter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 event_bus = EventBus()
@@ -266,3 +501,11 @@ def subscribe(
 
 def emmit(*, event_type: str, payload: dict):
     event_bus.add_event(event_type, payload)
+
+
+def emmit_many(*, events: Iterable[tuple[str, dict]]) -> int:
+    return event_bus.add_events(events)
+
+
+def buffered_emitter(*, max_events: int = 1000, max_delay: float = 0.05) -> BufferedEmitter:
+    return event_bus.buffered_emitter(max_events=max_events, max_delay=max_delay)
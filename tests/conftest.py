@@ -5,3 +5,8 @@ from gyjd import setup_defaults
 @pytest.fixture(scope="function")
 def reset_injector():
     setup_defaults(clear_dependencies=True)
+
+
+@pytest.fixture(scope="function")
+def event_bus_location(tmp_path):
+    return tmp_path / "event_bus.db"
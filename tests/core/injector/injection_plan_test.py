@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+
+from gyjd import gyjd
+from gyjd.core.simple_injector import clear_registered_dependencies, inject_dependencies, register_dependency
+
+
+@dataclass
+class MockConfig:
+    value: str = "registered"
+
+
+@inject_dependencies
+def get_value(prefix: str, config: MockConfig = None, *, suffix: str = "") -> str:
+    return f"{prefix}{config.value if config else None}{suffix}"
+
+
+def test_plan_is_refreshed_when_register_changes(reset_injector):
+    assert get_value("a-") == "a-None"
+
+    register_dependency(MockConfig)
+    assert get_value("a-") == "a-registered"
+
+    clear_registered_dependencies()
+    assert get_value("a-") == "a-None"
+
+
+def test_bound_arguments_are_not_injected(reset_injector):
+    register_dependency(MockConfig)
+
+    assert get_value("a-", MockConfig("positional")) == "a-positional"
+    assert get_value("a-", config=MockConfig("keyword")) == "a-keyword"
+
+
+def test_plan_exposes_parameter_types():
+    plan = get_value.__gyjd_injection_plan__
+
+    assert plan.parameter_types == {"prefix": str, "config": MockConfig, "suffix": str}
+
+
+def test_gyjd_callable_uses_plan(reset_injector):
+    @gyjd
+    def func(a: int, config: MockConfig = None):
+        return a, config.value
+
+    gyjd.register_dependency(lambda: MockConfig("first"), cls=MockConfig)
+    assert func(1) == (1, "first")
+
+    gyjd.register_dependency(lambda: MockConfig("second"), cls=MockConfig)
+    assert func(2) == (2, "second")
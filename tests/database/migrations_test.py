@@ -0,0 +1,88 @@
+import sqlite3
+
+import pytest
+from gyjd.database.connection_factory import ConnectionFactory
+from gyjd.database.migrations import EVENT_BUS_MIGRATIONS, apply_migrations, get_schema_version
+
+
+def _query_plan(conn: sqlite3.Connection, sql: str, parameters=()) -> str:
+    return "\n".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters))
+
+
+@pytest.fixture
+def conn(event_bus_location):
+    return ConnectionFactory.create_connection("event_bus", location=event_bus_location).conn
+
+
+def test_new_database_is_at_latest_version(conn):
+    assert get_schema_version(conn) == len(EVENT_BUS_MIGRATIONS)
+
+
+def test_existing_unversioned_database_is_upgraded(event_bus_location):
+    legacy = sqlite3.connect(event_bus_location)
+    for statement in EVENT_BUS_MIGRATIONS[0]:
+        legacy.execute(statement)
+    legacy.execute(
+        "INSERT INTO events (event_type, payload, created_at) VALUES ('legacy', '{}', CURRENT_TIMESTAMP)"
+    )
+    legacy.commit()
+    legacy.close()
+
+    conn = ConnectionFactory.create_connection("event_bus", location=event_bus_location).conn
+
+    assert get_schema_version(conn) == len(EVENT_BUS_MIGRATIONS)
+    assert conn.execute("SELECT event_type FROM events").fetchall() == [("legacy",)]
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"events_unprocessed_idx", "tasks_pending_scheduled_idx", "tasks_pending_subscriber_idx"} <= indexes
+
+
+def test_failed_migration_is_rolled_back(event_bus_location):
+    conn = sqlite3.connect(event_bus_location)
+    migrations = [
+        ("CREATE TABLE a (id INTEGER)",),
+        ("CREATE TABLE b (id INTEGER)", "CREATE TABLE a (id INTEGER)"),
+    ]
+
+    with pytest.raises(sqlite3.OperationalError):
+        apply_migrations(conn, migrations)
+
+    assert get_schema_version(conn) == 1
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {"a"}
+
+
+def test_unprocessed_events_use_partial_index(conn):
+    plan = _query_plan(conn, "SELECT min(id), max(id) FROM events WHERE processed = 0")
+    assert "events_unprocessed_idx" in plan
+
+    plan = _query_plan(
+        conn,
+        """
+            SELECT e.id FROM events e JOIN subscribers s ON s.task_name = e.event_type
+            WHERE e.processed = 0 AND e.id BETWEEN ? AND ?
+        """,
+        (1, 10),
+    )
+    assert "SEARCH e USING INDEX events_unprocessed_idx" in plan
+
+
+def test_due_tasks_use_pending_indexes(conn):
+    plan = _query_plan(
+        conn,
+        """
+            SELECT t.id, row_number() OVER (PARTITION BY t.subscriber_task_name ORDER BY t.scheduled_at)
+            FROM tasks t JOIN subscribers s ON t.subscriber_task_name = s.task_name
+            WHERE t.scheduled_at <= CURRENT_TIMESTAMP AND t.status = 'pending'
+        """,
+    )
+    assert "tasks_pending_subscriber_idx" in plan
+
+    plan = _query_plan(
+        conn, "SELECT min(scheduled_at) FROM tasks WHERE status = 'pending' AND scheduled_at > CURRENT_TIMESTAMP"
+    )
+    assert "tasks_pending_scheduled_idx" in plan
+
+
+def test_subscriber_status_uses_index(conn):
+    plan = _query_plan(conn, "SELECT count(*) FROM tasks WHERE subscriber_task_name = ? AND status = ?", ("a", "done"))
+    assert "COVERING INDEX tasks_subscriber_status_idx" in plan
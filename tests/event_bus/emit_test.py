@@ -0,0 +1,63 @@
+import time
+
+from gyjd.event_bus import EventBus
+
+
+def _stored_events(location) -> list[tuple[str, str]]:
+    # Read through a separate connection, so only committed events are visible.
+    reader = EventBus(location=location)
+    with reader._conn.cursor() as c:
+        c.execute("SELECT event_type, payload FROM events ORDER BY id")
+        return c.fetchall()
+
+
+def test_add_event_is_committed(event_bus_location):
+    bus = EventBus(location=event_bus_location)
+    bus.add_event("created", {"id": 1})
+
+    assert _stored_events(event_bus_location) == [("created", '{"id": 1}')]
+
+
+def test_add_events_inserts_all_events(event_bus_location):
+    bus = EventBus(location=event_bus_location)
+
+    assert bus.add_events([("created", {"id": 1}), ("deleted", {"id": 1})]) == 2
+    assert bus.add_events([]) == 0
+    assert _stored_events(event_bus_location) == [("created", '{"id": 1}'), ("deleted", '{"id": 1}')]
+
+
+def test_buffered_emitter_flushes_after_max_events(event_bus_location):
+    bus = EventBus(location=event_bus_location)
+    emitter = bus.buffered_emitter(max_events=3, max_delay=60)
+
+    emitter.emmit(event_type="created", payload={"id": 1})
+    emitter.emmit(event_type="created", payload={"id": 2})
+    assert _stored_events(event_bus_location) == []
+    assert len(emitter) == 2
+
+    emitter.emmit(event_type="created", payload={"id": 3})
+    assert len(_stored_events(event_bus_location)) == 3
+    assert len(emitter) == 0
+    emitter.close()
+
+
+def test_buffered_emitter_flushes_after_max_delay(event_bus_location):
+    bus = EventBus(location=event_bus_location)
+
+    with bus.buffered_emitter(max_events=1000, max_delay=0.01) as emitter:
+        emitter.emmit(event_type="created", payload={"id": 1})
+        deadline = time.monotonic() + 2
+        while not (stored := _stored_events(event_bus_location)) and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+        assert stored == [("created", '{"id": 1}')]
+
+
+def test_buffered_emitter_flushes_on_close(event_bus_location):
+    bus = EventBus(location=event_bus_location)
+
+    with bus.buffered_emitter(max_events=1000, max_delay=60) as emitter:
+        for i in range(10):
+            emitter.emmit(event_type="created", payload={"id": i})
+
+    assert [payload for _, payload in _stored_events(event_bus_location)] == [f'{{"id": {i}}}' for i in range(10)]
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+from gyjd.event_bus import EventBus
+
+received: list[tuple[float, list]] = []
+
+
+async def record_event(parameters):
+    received.append((time.monotonic(), parameters))
+
+
+async def _run_until_received(bus: EventBus, emit, timeout: float = 2):
+    received.clear()
+    runner = asyncio.create_task(bus.run_forever())
+    try:
+        # Let the bus go idle with a long backoff before emitting.
+        await asyncio.sleep(0.2)
+        emitted_at = time.monotonic()
+        emit()
+        while not received and time.monotonic() - emitted_at < timeout:
+            await asyncio.sleep(0.001)
+        return emitted_at
+    finally:
+        runner.cancel()
+        try:
+            await runner
+        except asyncio.CancelledError:
+            pass
+
+
+def test_local_emit_wakes_idle_bus(event_bus_location):
+    bus = EventBus(polling_interval=60, location=event_bus_location)
+    bus.subscribe(["user_created"], f"{__name__}.record_event", "record_event")
+
+    emitted_at = asyncio.run(_run_until_received(bus, lambda: bus.add_event("user_created", {"id": 1})))
+
+    assert received
+    handled_at, parameters = received[0]
+    assert parameters == [{"id": 1}]
+    assert handled_at - emitted_at < 0.5
+
+
+def test_emit_from_other_process_is_detected(event_bus_location):
+    bus = EventBus(polling_interval=0.05, location=event_bus_location)
+    bus.subscribe(["user_created"], f"{__name__}.record_event", "record_event")
+    other_process_bus = EventBus(location=event_bus_location)
+
+    def emit():
+        other_process_bus.add_event("user_created", {"id": 2})
+        other_process_bus._conn.conn.commit()
+
+    asyncio.run(_run_until_received(bus, emit))
+
+    assert received[0][1] == [{"id": 2}]